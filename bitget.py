@@ -1,22 +1,38 @@
 import asyncio
 import hashlib
 import hmac
-import json
+import math
+import random
+import ssl
 import traceback
-from time import time
+from time import time, time_ns
 from typing import Union, List, Dict
-from urllib.parse import urlencode
+from urllib.parse import quote_plus
 from uuid import uuid4
 
-import aiohttp
 import base64
+import httpx
 import numpy as np
+import orjson
 import pprint
 
 from njit_funcs import round_
 from passivbot import Bot
 from procedures import print_async_exception, print_
-from pure_funcs import ts_to_date, sort_dict_keys, date_to_ts
+from pure_funcs import ts_to_date, date_to_ts, create_xk
+
+
+def stringify_param(v) -> str:
+    # most params are already str, so check that first; bools are lowercased for the api
+    if v.__class__ is str:
+        return v
+    if v is True or v is False or v.__class__ is np.bool_:
+        return "true" if v else "false"
+    return str(v)
+
+
+def stringify_params(params: dict) -> dict:
+    return {k: stringify_param(v) for k, v in params.items()}
 
 
 def first_capitalized(s: str):
@@ -24,14 +40,72 @@ def first_capitalized(s: str):
 
 
 def truncate_float(x: float, d: int) -> float:
-    xs = str(x)
-    return float(xs[: xs.find(".") + d + 1])
+    # truncates toward zero; nudging by a few ulps keeps e.g. 0.29 * 100 == 28.999... from
+    # dropping to 0.28, matching the digits of str(x)
+    m = 10**d
+    p = x * m
+    return int(p + math.copysign(4 * math.ulp(p), p)) / m
+
+
+def standardize_cancelled_order(elm: dict) -> dict:
+    return {"deleted_order_id": elm["ordId"]}
+
+
+def standardize_new_order(elm: dict) -> dict:
+    return {
+        "new_open_order": {
+            "order_id": elm["ordId"],
+            "symbol": elm["instId"],
+            "price": float(elm["px"]),
+            "qty": float(elm["sz"]),
+            "type": elm["ordType"],
+            "side": elm["side"],
+            "position_side": elm["posSide"],
+            "timestamp": elm["uTime"],
+        }
+    }
+
+
+def standardize_partially_filled_order(elm: dict) -> dict:
+    return {"deleted_order_id": elm["ordId"], "partially_filled": True}
+
+
+def standardize_filled_order(elm: dict) -> dict:
+    return {"deleted_order_id": elm["ordId"], "filled": True}
+
+
+ORDER_STATUS_HANDLERS = {
+    "cancelled": standardize_cancelled_order,
+    "new": standardize_new_order,
+    "partial-fill": standardize_partially_filled_order,
+    "full-fill": standardize_filled_order,
+}
 
 
 class BitgetBot(Bot):
+    ping_msg = orjson.dumps({"op": "ping"}).decode()
+    _METHOD_GET = b"GET"
+    _METHOD_POST = b"POST"
+    signing_backend_logged = False  # log the OpenSSL/hashlib build once per process
+
     def __init__(self, config: dict):
         self.exchange = "bitget"
         super().__init__(config)
+        # keyed once; copied per request so the inner/outer pads are not re-derived each call.
+        # a hashlib constructor (not the "sha256" string) keeps hmac on OpenSSL, which selects
+        # SHA extensions at runtime
+        self._secret_bytes = self.secret.encode("utf-8")
+        self._hmac_template = hmac.new(self._secret_bytes, digestmod=hashlib.sha256)
+        if not BitgetBot.signing_backend_logged:
+            BitgetBot.signing_backend_logged = True
+            print_(["signing with hmac-sha256 via", ssl.OPENSSL_VERSION])
+            print_(["hashlib algorithms available", sorted(hashlib.algorithms_available)])
+        self._header_static = {
+            "Content-Type": "application/json",
+            "locale": "en-US",
+            "ACCESS-KEY": self.key,
+            "ACCESS-PASSPHRASE": self.passphrase,
+        }
         self.base_endpoint = "https://api.bitget.com"
         self.endpoints = {
             "exchange_info": "/api/mix/v1/market/contracts",
@@ -54,6 +128,12 @@ class BitgetBot(Bot):
             "buy": {"long": "open_long", "short": "close_short"},
             "sell": {"long": "close_long", "short": "open_short"},
         }
+        self.order_side_pos_map = {
+            (side, position_side): api_side
+            for side, position_sides in self.order_side_map.items()
+            for position_side, api_side in position_sides.items()
+        }
+        self.buy_api_sides = {"open_long", "close_short"}
         self.fill_side_map = {
             "close_long": "sell",
             "open_long": "buy",
@@ -72,7 +152,18 @@ class BitgetBot(Bot):
             "1w": "604800",
         }
         self.broker_code = "Passivbot"
-        self.session = aiohttp.ClientSession()
+        # one pooled HTTP/2 client for the bot's lifetime; concurrent requests share a connection
+        self.session = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=100, max_keepalive_connections=32, keepalive_expiry=75
+            ),
+            timeout=30.0,
+        )
+        self.init_signers()
+
+    async def close(self) -> None:
+        await self.session.aclose()
 
     def init_market_type(self):
         self.symbol_stripped = self.symbol
@@ -94,10 +185,39 @@ class BitgetBot(Bot):
             ] = 6.0  # will complain with $5 even if order cost > $5
         else:
             raise NotImplementedError("not yet implemented")
+        # subscriptions only depend on the market, so serialize them once
+        self.market_sub_msg = orjson.dumps(
+            {
+                "op": "subscribe",
+                "args": [{"instType": "mc", "channel": "trade", "instId": self.symbol_stripped}],
+            }
+        ).decode()
+        self.user_sub_msgs = [
+            orjson.dumps(
+                {
+                    "op": "subscribe",
+                    "args": [
+                        {
+                            "instType": self.product_type.upper(),
+                            "channel": channel,
+                            "instId": "default",
+                        }
+                    ],
+                }
+            ).decode()
+            for channel in ["account", "positions", "orders"]
+        ]
 
     async def _init(self):
         self.init_market_type()
-        info = await self.fetch_exchange_info()
+        # the ticker only needs the symbol, so fetch it alongside the contract info
+        # wait for both before raising, so a failed info fetch leaves no orphaned ticker task
+        info, ob_result = await asyncio.gather(
+            self.fetch_exchange_info(), self.init_order_book(), return_exceptions=True
+        )
+        for result in [info, ob_result]:
+            if isinstance(result, BaseException):
+                raise result
         for e in info["data"]:
             if e["symbol"] == self.symbol:
                 break
@@ -112,9 +232,10 @@ class BitgetBot(Bot):
         self.qty_step = self.config["qty_step"] = round_(10 ** (-int(e["volumePlace"])), 0.00000001)
         self.min_qty = self.config["min_qty"] = float(e["minTradeNum"])
         self.margin_coin = self.coin if self.product_type == "dmcbl" else self.quote
-        await super()._init()
-        await self.init_order_book()
-        await self.update_position()
+        self._symbol_params = {"symbol": self.symbol, "marginCoin": self.margin_coin}
+        # same steps as Bot._init, but xk is set up front since update_position needs it
+        self.xk = create_xk(self.config)
+        await asyncio.gather(self.init_fills(), self.update_position())
 
     async def fetch_exchange_info(self):
         info = await self.public_get(
@@ -143,6 +264,9 @@ class BitgetBot(Bot):
 
     async def fetch_open_orders(self) -> [dict]:
         fetched = await self.private_get(self.endpoints["open_orders"], {"symbol": self.symbol})
+        return self.parse_open_orders(fetched)
+
+    def parse_open_orders(self, fetched: dict) -> [dict]:
         return [
             {
                 "order_id": elm["orderId"],
@@ -150,7 +274,7 @@ class BitgetBot(Bot):
                 "symbol": elm["symbol"],
                 "price": float(elm["price"]),
                 "qty": float(elm["size"]),
-                "side": "buy" if elm["side"] in ["close_short", "open_long"] else "sell",
+                "side": "buy" if elm["side"] in self.buy_api_sides else "sell",
                 "position_side": elm["posSide"],
                 "timestamp": float(elm["cTime"]),
             }
@@ -158,62 +282,66 @@ class BitgetBot(Bot):
         ]
 
     async def public_get(self, url: str, params: dict = {}) -> dict:
-        async with self.session.get(self.base_endpoint + url, params=params) as response:
-            result = await response.text()
-        return json.loads(result)
+        response = await self.session.get(self.base_endpoint + url, params=params)
+        return orjson.loads(response.content)
+
+    def init_signers(self):
+        """
+        binds self._signed_get and self._signed_post with the session methods, static header and
+        hmac template captured as locals, so a signed request does no attribute lookups or
+        get/post branching
+        """
+        session_get = self.session.get
+        session_post = self.session.post
+        header_static = self._header_static
+        hmac_template = self._hmac_template
+        b64encode = base64.b64encode
+        method_get = self._METHOD_GET
+        method_post = self._METHOD_POST
+
+        def sign(to_sign: bytes, timestamp: str) -> dict:
+            mac = hmac_template.copy()
+            mac.update(to_sign)
+            return {
+                **header_static,
+                "ACCESS-SIGN": b64encode(mac.digest()).decode("utf-8"),
+                "ACCESS-TIMESTAMP": timestamp,
+            }
+
+        async def signed_get(url: str, params: dict, base_endpoint: str) -> dict:
+            timestamp = str(time_ns() // 1_000_000)
+            params = stringify_params(params)
+            # params are flat and already stringified; build the sorted query in one pass
+            url = url + "?" + "&".join(f"{k}={quote_plus(v)}" for k, v in sorted(params.items()))
+            header = sign(timestamp.encode() + method_get + url.encode("utf-8"), timestamp)
+            response = await session_get(base_endpoint + url, headers=header)
+            return orjson.loads(response.content)
+
+        async def signed_post(url: str, params: dict, base_endpoint: str) -> dict:
+            timestamp = str(time_ns() // 1_000_000)
+            # serialized once; the same bytes are signed and sent
+            body = orjson.dumps(stringify_params(params))
+            header = sign(timestamp.encode() + method_post + url.encode("utf-8") + body, timestamp)
+            response = await session_post(base_endpoint + url, headers=header, content=body)
+            return orjson.loads(response.content)
+
+        self._signed_get = signed_get
+        self._signed_post = signed_post
 
     async def private_(
         self, type_: str, base_endpoint: str, url: str, params: dict = {}, json_: bool = False
     ) -> dict:
-
-        timestamp = int(time() * 1000)
-        params = {
-            k: ("true" if v else "false") if type(v) == bool else str(v) for k, v in params.items()
-        }
-        if type_ == "get":
-            url = url + "?" + urlencode(sort_dict_keys(params))
-            to_sign = str(timestamp) + type_.upper() + url
-        elif type_ == "post":
-            to_sign = str(timestamp) + type_.upper() + url + json.dumps(params)
-        signature = base64.b64encode(
-            hmac.new(
-                self.secret.encode("utf-8"),
-                to_sign.encode("utf-8"),
-                digestmod="sha256",
-            ).digest()
-        ).decode("utf-8")
-        header = {
-            "Content-Type": "application/json",
-            "locale": "en-US",
-            "ACCESS-KEY": self.key,
-            "ACCESS-SIGN": signature,
-            "ACCESS-TIMESTAMP": str(timestamp),
-            "ACCESS-PASSPHRASE": self.passphrase,
-        }
-        if type_ == "post":
-            async with getattr(self.session, type_)(
-                base_endpoint + url, headers=header, data=json.dumps(params)
-            ) as response:
-                result = await response.text()
-        elif type_ == "get":
-            async with getattr(self.session, type_)(base_endpoint + url, headers=header) as response:
-                result = await response.text()
-        return json.loads(result)
+        signed = self._signed_get if type_ == "get" else self._signed_post
+        return await signed(url, params, base_endpoint)
 
     async def private_get(self, url: str, params: dict = {}, base_endpoint: str = None) -> dict:
-        return await self.private_(
-            type_="get",
-            base_endpoint=self.base_endpoint if base_endpoint is None else base_endpoint,
-            url=url,
-            params=params,
+        return await self._signed_get(
+            url, params, self.base_endpoint if base_endpoint is None else base_endpoint
         )
 
     async def private_post(self, url: str, params: dict = {}, base_endpoint: str = None) -> dict:
-        return await self.private_(
-            type_="post",
-            base_endpoint=self.base_endpoint if base_endpoint is None else base_endpoint,
-            url=url,
-            params=params,
+        return await self._signed_post(
+            url, params, self.base_endpoint if base_endpoint is None else base_endpoint
         )
 
     async def transfer_from_derivatives_to_spot(self, coin: str, amount: float):
@@ -239,17 +367,18 @@ class BitgetBot(Bot):
                  "short": {...},
                  "wallet_balance": float}
         """
+        fetched_pos, fetched_balance = await asyncio.gather(
+            self.private_get(self.endpoints["position"], self._symbol_params),
+            self.private_get(self.endpoints["balance"], {"productType": self.product_type}),
+        )
+        return self.parse_position(fetched_pos, fetched_balance)
+
+    def parse_position(self, fetched_pos: dict, fetched_balance: dict) -> dict:
         position = {
             "long": {"size": 0.0, "price": 0.0, "liquidation_price": 0.0},
             "short": {"size": 0.0, "price": 0.0, "liquidation_price": 0.0},
             "wallet_balance": 0.0,
         }
-        fetched_pos, fetched_balance = await asyncio.gather(
-            self.private_get(
-                self.endpoints["position"], {"symbol": self.symbol, "marginCoin": self.margin_coin}
-            ),
-            self.private_get(self.endpoints["balance"], {"productType": self.product_type}),
-        )
         for elm in fetched_pos["data"]:
             if elm["holdSide"] == "long":
                 position["long"] = {
@@ -268,25 +397,42 @@ class BitgetBot(Bot):
             if elm["marginCoin"] == self.margin_coin:
                 if self.product_type == "dmcbl":
                     # convert balance to usd using mean of emas as price
-                    all_emas = list(self.emas_long) + list(self.emas_short)
-                    if any(ema == 0.0 for ema in all_emas):
+                    if (self.emas_long == 0.0).any() or (self.emas_short == 0.0).any():
                         # catch case where any ema is zero
-                        all_emas = self.ob
-                    position["wallet_balance"] = float(elm["available"]) * np.mean(all_emas)
+                        mean_price = (self.ob[0] + self.ob[1]) / 2
+                    else:
+                        mean_price = (self.emas_long.sum() + self.emas_short.sum()) / (
+                            self.emas_long.size + self.emas_short.size
+                        )
+                    position["wallet_balance"] = float(elm["available"]) * mean_price
                 else:
                     position["wallet_balance"] = float(elm["available"])
                 break
 
         return position
 
+    async def fetch_state(self) -> ([dict], dict):
+        """
+        fetches open orders, position and balance in one concurrent round trip
+        returns (open_orders, position), formatted as by fetch_open_orders and fetch_position
+        """
+        fetched_open_orders, fetched_pos, fetched_balance = await asyncio.gather(
+            self.private_get(self.endpoints["open_orders"], {"symbol": self.symbol}),
+            self.private_get(self.endpoints["position"], self._symbol_params),
+            self.private_get(self.endpoints["balance"], {"productType": self.product_type}),
+        )
+        return (
+            self.parse_open_orders(fetched_open_orders),
+            self.parse_position(fetched_pos, fetched_balance),
+        )
+
     async def execute_order(self, order: dict) -> dict:
         o = None
         try:
             params = {
-                "symbol": self.symbol,
-                "marginCoin": self.margin_coin,
+                **self._symbol_params,
                 "size": str(order["qty"]),
-                "side": self.order_side_map[order["side"]][order["position_side"]],
+                "side": self.order_side_pos_map[(order["side"], order["position_side"])],
                 "orderType": order["type"],
                 "presetTakeProfitPrice": "",
                 "presetStopLossPrice": "",
@@ -296,7 +442,7 @@ class BitgetBot(Bot):
                 params["price"] = str(order["price"])
             else:
                 params["timeInForceValue"] = "normal"
-            random_str = f"{str(int(time() * 1000))[-6:]}_{int(np.random.random() * 10000)}"
+            random_str = f"{time_ns() // 1_000_000 % 1_000_000:06d}_{random.randrange(10000)}"
             custom_id = order["custom_id"] if "custom_id" in order else "0"
             params["clientOid"] = f"{self.broker_code}#{custom_id}_{random_str}"
             o = await self.private_post(self.endpoints["create_order"], params)
@@ -324,7 +470,7 @@ class BitgetBot(Bot):
         try:
             cancellation = await self.private_post(
                 self.endpoints["cancel_order"],
-                {"symbol": self.symbol, "marginCoin": self.margin_coin, "orderId": order["order_id"]},
+                {**self._symbol_params, "orderId": order["order_id"]},
             )
             return {
                 "symbol": self.symbol,
@@ -525,7 +671,7 @@ class BitgetBot(Bot):
             params["startTime"] = int(round(start_time))
 
         # always fetch as many fills as possible
-        params["endTime"] = int(round(time() + 60 * 60 * 24) * 1000)
+        params["endTime"] = time_ns() // 1_000_000 + 1000 * 60 * 60 * 24
         try:
             fetched = await self.private_get(self.endpoints["fills"], params)
             fills = [
@@ -557,17 +703,13 @@ class BitgetBot(Bot):
             # set margin mode
             res = await self.private_post(
                 self.endpoints["set_margin_mode"],
-                params={
-                    "symbol": self.symbol,
-                    "marginCoin": self.margin_coin,
-                    "marginMode": "crossed",
-                },
+                params={**self._symbol_params, "marginMode": "crossed"},
             )
             print(res)
             # set leverage
             res = await self.private_post(
                 self.endpoints["set_leverage"],
-                params={"symbol": self.symbol, "marginCoin": self.margin_coin, "leverage": 20},
+                params={**self._symbol_params, "leverage": 20},
             )
             print(res)
         except Exception as e:
@@ -576,8 +718,22 @@ class BitgetBot(Bot):
     def standardize_market_stream_event(self, data: dict) -> [dict]:
         if "action" not in data or data["action"] != "update":
             return []
+        rows = data["data"]
+        try:
+            # one try for the whole burst; the per-tick loop below only runs if a row is malformed
+            return [
+                {
+                    "timestamp": int(e[0]),
+                    "price": float(e[1]),
+                    "qty": float(e[2]),
+                    "is_buyer_maker": e[3] == "sell",
+                }
+                for e in rows
+            ]
+        except Exception:
+            pass
         ticks = []
-        for e in data["data"]:
+        for e in rows:
             try:
                 ticks.append(
                     {
@@ -595,7 +751,7 @@ class BitgetBot(Bot):
         while True:
             await asyncio.sleep(27)
             try:
-                await self.ws_user.send(json.dumps({"op": "ping"}))
+                await self.ws_user.send(self.ping_msg)
             except Exception as e:
                 traceback.print_exc()
                 print_(["error sending heartbeat user", e])
@@ -604,38 +760,21 @@ class BitgetBot(Bot):
         while True:
             await asyncio.sleep(27)
             try:
-                await self.ws_market.send(json.dumps({"op": "ping"}))
+                await self.ws_market.send(self.ping_msg)
             except Exception as e:
                 traceback.print_exc()
                 print_(["error sending heartbeat market", e])
 
     async def subscribe_to_market_stream(self, ws):
-        await ws.send(
-            json.dumps(
-                {
-                    "op": "subscribe",
-                    "args": [
-                        {
-                            "instType": "mc",
-                            "channel": "trade",
-                            "instId": self.symbol_stripped,
-                        }
-                    ],
-                }
-            )
-        )
+        await ws.send(self.market_sub_msg)
 
     async def subscribe_to_user_stream(self, ws):
         timestamp = int(time())
-        signature = base64.b64encode(
-            hmac.new(
-                self.secret.encode("utf-8"),
-                f"{timestamp}GET/user/verify".encode("utf-8"),
-                digestmod="sha256",
-            ).digest()
-        ).decode("utf-8")
+        mac = self._hmac_template.copy()
+        mac.update(f"{timestamp}GET/user/verify".encode("utf-8"))
+        signature = base64.b64encode(mac.digest()).decode("utf-8")
         res = await ws.send(
-            json.dumps(
+            orjson.dumps(
                 {
                     "op": "login",
                     "args": [
@@ -647,104 +786,59 @@ class BitgetBot(Bot):
                         }
                     ],
                 }
-            )
-        )
-        print(res)
-        res = await ws.send(
-            json.dumps(
-                {
-                    "op": "subscribe",
-                    "args": [
-                        {
-                            "instType": self.product_type.upper(),
-                            "channel": "account",
-                            "instId": "default",
-                        }
-                    ],
-                }
-            )
-        )
-        print(res)
-        res = await ws.send(
-            json.dumps(
-                {
-                    "op": "subscribe",
-                    "args": [
-                        {
-                            "instType": self.product_type.upper(),
-                            "channel": "positions",
-                            "instId": "default",
-                        }
-                    ],
-                }
-            )
-        )
-        print(res)
-        res = await ws.send(
-            json.dumps(
-                {
-                    "op": "subscribe",
-                    "args": [
-                        {
-                            "channel": "orders",
-                            "instType": self.product_type.upper(),
-                            "instId": "default",
-                        }
-                    ],
-                }
-            )
+            ).decode()
         )
         print(res)
+        for msg in self.user_sub_msgs:
+            res = await ws.send(msg)
+            print(res)
 
     async def transfer(self, type_: str, amount: float, asset: str = "USDT"):
         return {"code": "-1", "msg": "Transferring funds not supported for Bybit"}
 
-    def standardize_user_stream_event(
-        self, event: Union[List[Dict], Dict]
-    ) -> Union[List[Dict], Dict]:
-
+    def standardize_order_events(self, data: [dict]) -> [dict]:
         events = []
-        if "arg" in event and "data" in event and "channel" in event["arg"]:
-            if event["arg"]["channel"] == "orders":
-                for elm in event["data"]:
-                    if elm["instId"] == self.symbol and "status" in elm:
-                        standardized = {}
-                        if elm["status"] == "cancelled":
-                            standardized["deleted_order_id"] = elm["ordId"]
-                        elif elm["status"] == "new":
-                            standardized["new_open_order"] = {
-                                "order_id": elm["ordId"],
-                                "symbol": elm["instId"],
-                                "price": float(elm["px"]),
-                                "qty": float(elm["sz"]),
-                                "type": elm["ordType"],
-                                "side": elm["side"],
-                                "position_side": elm["posSide"],
-                                "timestamp": elm["uTime"],
-                            }
-                        elif elm["status"] == "partial-fill":
-                            standardized["deleted_order_id"] = elm["ordId"]
-                            standardized["partially_filled"] = True
-                        elif elm["status"] == "full-fill":
-                            standardized["deleted_order_id"] = elm["ordId"]
-                            standardized["filled"] = True
-                        events.append(standardized)
-            if event["arg"]["channel"] == "positions":
-                for elm in event["data"]:
-                    if elm["instId"] == self.symbol and "averageOpenPrice" in elm:
-                        standardized = {
-                            f"psize_{elm['holdSide']}": round_(
-                                abs(float(elm["total"])), self.qty_step
-                            )
-                            * (-1 if elm["holdSide"] == "short" else 1),
-                            f"pprice_{elm['holdSide']}": truncate_float(
-                                float(elm["averageOpenPrice"]), self.price_rounding
-                            ),
-                        }
-                        events.append(standardized)
+        for elm in data:
+            if elm["instId"] == self.symbol and "status" in elm:
+                handler = ORDER_STATUS_HANDLERS.get(elm["status"])
+                events.append({} if handler is None else handler(elm))
+        return events
 
-            if event["arg"]["channel"] == "account":
-                for elm in event["data"]:
-                    if elm["marginCoin"] == self.quote:
-                        events.append({"wallet_balance": float(elm["available"])})
+    def standardize_position_events(self, data: [dict]) -> [dict]:
+        events = []
+        for elm in data:
+            if elm["instId"] == self.symbol and "averageOpenPrice" in elm:
+                standardized = {
+                    f"psize_{elm['holdSide']}": round_(abs(float(elm["total"])), self.qty_step)
+                    * (-1 if elm["holdSide"] == "short" else 1),
+                    f"pprice_{elm['holdSide']}": truncate_float(
+                        float(elm["averageOpenPrice"]), self.price_rounding
+                    ),
+                }
+                events.append(standardized)
         return events
+
+    def standardize_account_events(self, data: [dict]) -> [dict]:
+        return [
+            {"wallet_balance": float(elm["available"])}
+            for elm in data
+            if elm["marginCoin"] == self.quote
+        ]
+
+    user_stream_channel_handlers = {
+        "orders": standardize_order_events,
+        "positions": standardize_position_events,
+        "account": standardize_account_events,
+    }
+
+    def standardize_user_stream_event(
+        self, event: Union[List[Dict], Dict]
+    ) -> Union[List[Dict], Dict]:
+        arg = event.get("arg")
+        data = event.get("data")
+        if arg is None or data is None:
+            return []
+        handler = self.user_stream_channel_handlers.get(arg.get("channel"))
+        if handler is None:
+            return []
+        return handler(self, data)
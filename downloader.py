@@ -763,7 +763,7 @@ class Downloader:
                     self.save_dataframe(df, "", True, False)
 
         try:
-            await self.bot.session.close()
+            await self.bot.close()
         except:
             pass
 
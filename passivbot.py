@@ -399,6 +399,9 @@ class Bot:
         finally:
             self.ts_released["cancel_orders"] = time()
 
+    async def close(self) -> None:
+        await self.session.close()
+
     def stop(self, signum=None, frame=None) -> None:
         logging.info("Stopping passivbot, please wait...")
         try:
@@ -1269,10 +1272,16 @@ async def main() -> None:
     signal.signal(signal.SIGINT, bot.stop)
     signal.signal(signal.SIGTERM, bot.stop)
     await start_bot(bot)
-    await bot.session.close()
+    await bot.close()
 
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        print("uvloop not found, using default asyncio event loop...")
     try:
         asyncio.run(main())
     except Exception as e:
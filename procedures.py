@@ -230,7 +230,7 @@ async def fetch_market_specific_settings(config: dict):
         settings_from_exchange["exchange"] = "bitget"
     else:
         raise Exception(f"unknown exchange {exchange}")
-    await bot.session.close()
+    await bot.close()
     if "inverse" in bot.market_type:
         settings_from_exchange["inverse"] = True
     elif any(x in bot.market_type for x in ["linear", "spot"]):